@@ -4,61 +4,386 @@ Botanical Library API Server
 Simple Flask API to serve plant data from SQLite database to Vue frontend.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, make_response, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import json
+import queue
 import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional: without orjson, Flask's default JSON encoder is used
+    orjson = None
+
+try:
+    from cachetools import TTLCache, cached
+except ImportError:  # Optional: without cachetools, every request reads the database
+    TTLCache = cached = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib encoder."""
+    
+    def _options(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(
+            obj, default=self.default, option=self._options(bool(kwargs.get('indent')))
+        ).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self._options(indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for Vue development server
 
 # Database path
 DB_PATH = Path(__file__).parent / 'botanical_library.db'
 
 
-def get_db_connection():
-    """Create a database connection."""
-    conn = sqlite3.connect(str(DB_PATH))
+# Connection pool settings
+POOL_SIZE = 8
+
+# Pooled connections unused for this many seconds are closed, so a quiet
+# server does not hold the database file open. Windows refuses to replace
+# an open file, and convert_to_sqlite.py swaps a rebuilt database in.
+POOL_IDLE_TIMEOUT = 10.0
+
+# Last in, first out: busy periods reuse the warmest connections and the
+# surplus ones go idle
+_pool: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue(maxsize=POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_created = 0
+_reaper: Optional[threading.Thread] = None
+
+
+def db_signature() -> tuple:
+    """Identify the database file on disk; changes whenever it is rebuilt."""
+    stat = DB_PATH.stat()
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection that remembers which build of the database file it opened."""
+    signature: Optional[tuple] = None
+    returned_at = 0.0  # time.monotonic() when last put back in the pool
+
+
+def create_db_connection() -> PooledConnection:
+    """Create a database connection tuned for a long-lived reader."""
+    # Taken before connecting, so a rebuild in between makes the connection
+    # look stale rather than current
+    try:
+        signature = db_signature()
+    except OSError:
+        signature = None
+    
+    # Autocommit mode (the API only reads) and a prepared-statement cache
+    # large enough for every query text the endpoints generate
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=512,
+        factory=PooledConnection
+    )
+    conn.signature = signature
     conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    # The journal mode is left as built: switching to WAL would rewrite the
+    # file header, and the browser build (sql.js) cannot open WAL databases
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
     return conn
 
 
-def row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
-    """Convert SQLite row to dictionary."""
-    return {key: row[key] for key in row.keys()}
+def _open_pooled_conn() -> PooledConnection:
+    """Open a connection for a pool slot that has already been counted."""
+    global _pool_created
+    
+    try:
+        return create_db_connection()
+    except Exception:
+        with _pool_lock:
+            _pool_created -= 1
+        raise
 
 
-def get_plant_details(conn: sqlite3.Connection, plant_id: str) -> Optional[Dict[str, Any]]:
-    """Get complete plant details including related data."""
-    cursor = conn.cursor()
+def _close_idle_connections() -> None:
+    """Close pooled connections unused for POOL_IDLE_TIMEOUT seconds (runs forever)."""
+    global _pool_created
     
-    # Get main plant data
-    cursor.execute('SELECT * FROM plants WHERE id = ?', (plant_id,))
-    plant_row = cursor.fetchone()
+    while True:
+        time.sleep(POOL_IDLE_TIMEOUT / 2)
+        deadline = time.monotonic() - POOL_IDLE_TIMEOUT
+        # Holding the lock while the pool is drained makes a concurrent
+        # borrower wait for it, then see the freed slots instead of blocking
+        with _pool_lock:
+            keep = []
+            while True:
+                try:
+                    conn = _pool.get_nowait()
+                except queue.Empty:
+                    break
+                if conn.returned_at < deadline:
+                    conn.close()
+                    _pool_created -= 1
+                else:
+                    keep.append(conn)
+            # Drained newest first; put back oldest first to keep the order
+            for conn in reversed(keep):
+                _pool.put_nowait(conn)
+
+
+@contextmanager
+def borrow_conn() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled database connection for the duration of a request.
+    
+    Connections are created lazily up to POOL_SIZE and returned to the
+    pool afterwards, so SQLite's page cache stays warm between requests;
+    a background thread closes the ones left idle. A pooled connection opened before the database was rebuilt still reads
+    the old file, so it is closed and replaced when the file has changed.
+    """
+    global _pool_created, _reaper
     
-    if not plant_row:
-        return None
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            can_create = _pool_created < POOL_SIZE
+            if can_create:
+                _pool_created += 1
+            if _reaper is None:
+                _reaper = threading.Thread(
+                    target=_close_idle_connections, name='db-pool-reaper', daemon=True
+                )
+                _reaper.start()
+        if can_create:
+            conn = _open_pooled_conn()
+        else:
+            conn = _pool.get()
     
-    plant = row_to_dict(plant_row)
+    try:
+        current = db_signature()
+    except OSError:
+        current = conn.signature
+    if conn.signature != current:
+        conn.close()
+        conn = _open_pooled_conn()
     
-    # Get uses
-    cursor.execute('SELECT use_name FROM plant_uses WHERE plant_id = ?', (plant_id,))
-    plant['uses'] = [row['use_name'] for row in cursor.fetchall()]
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.returned_at = time.monotonic()
+        _pool.put(conn)
+
+
+# JSON-encoded relation columns on plants and the API field each one maps to
+RELATION_COLUMNS = {
+    'uses_json': 'uses',
+    'harvest_months_json': 'harvestMonths',
+    'certification_json': 'certification',
+    'keywords_json': 'keywords',
+}
+
+
+def get_plants_bulk(plant_rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    """
+    Convert a batch of plant rows into API dictionaries.
     
-    # Get harvest months
-    cursor.execute('SELECT month FROM harvest_months WHERE plant_id = ? ORDER BY month', (plant_id,))
-    plant['harvestMonths'] = [row['month'] for row in cursor.fetchall()]
+    Related data (uses, harvest months, certifications, keywords) is stored
+    as JSON columns on the plants row itself, so no further queries are
+    needed; the order of plant_rows is preserved.
+    """
+    plants = []
+    for row in plant_rows:
+        plant = dict(row)
+        for column, field in RELATION_COLUMNS.items():
+            plant[field] = json.loads(plant.pop(column) or '[]')
+        plants.append(plant)
+    return plants
+
+
+# json_object() arguments that build a plant's API representation inside
+# SQLite, for list endpoints that return rows without decoding them in Python.
+# Expects the plants table (or a subquery over it) aliased as p.
+PLANT_JSON_FIELDS = '''
+    'id', p.id, 'name', p.name, 'scientificName', p.scientificName,
+    'type', p.type, 'origin', p.origin, 'color', p.color,
+    'nutritionScore', p.nutritionScore, 'efficacyScore', p.efficacyScore,
+    'commercialValue', p.commercialValue, 'description', p.description,
+    'detailedInfo', p.detailedInfo, 'region', p.region, 'spacing', p.spacing,
+    'climate', p.climate, 'soilType', p.soilType, 'warning', p.warning,
+    'severity', p.severity, 'created_at', p.created_at,
+    'uses', json(p.uses_json), 'harvestMonths', json(p.harvest_months_json),
+    'certification', json(p.certification_json), 'keywords', json(p.keywords_json)
+'''
+
+
+def json_rows_response(payloads: List[str], **fields: Any) -> Response:
+    """
+    Build a successful JSON response around plant objects already encoded by SQLite.
     
-    # Get certifications
-    cursor.execute('SELECT certification FROM certifications WHERE plant_id = ?', (plant_id,))
-    plant['certification'] = [row['certification'] for row in cursor.fetchall()]
+    The payloads are spliced into the body verbatim as the 'data' array;
+    the remaining fields are encoded normally.
+    """
+    meta = {'success': True, **fields}
+    if orjson is not None:
+        meta = orjson.dumps(meta)
+    else:
+        meta = json.dumps(meta, separators=(',', ':')).encode()
+    body = b'{"data":[' + ','.join(payloads).encode() + b'],' + meta[1:]
+    return Response(body, mimetype='application/json')
+
+
+def get_plant_details(conn: sqlite3.Connection, plant_id: str) -> Optional[Dict[str, Any]]:
+    """Get complete plant details including related data."""
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM plants WHERE id = ?', (plant_id,))
+    plants = get_plants_bulk(cursor.fetchall())
+    return plants[0] if plants else None
+
+
+def ttl_cached(maxsize: int, ttl: float, key):
+    """Cache a loader's results for ttl seconds; a no-op without cachetools."""
+    if TTLCache is None:
+        return lambda func: func
+    return cached(TTLCache(maxsize=maxsize, ttl=ttl), key=key, lock=threading.Lock())
+
+
+# Caches for data that only changes when the database is rebuilt.
+# Stats and categories are keyed by the request path, plants by ID. Keys
+# also carry the database signature, so results read before a rebuild are
+# never served for the new file; they just age out.
+def _path_key(*args, **kwargs) -> tuple:
+    return (db_signature(), request.full_path)
+
+
+@ttl_cached(maxsize=256, ttl=300, key=_path_key)
+def load_stats() -> Dict[str, Any]:
+    """Compute database statistics."""
+    with borrow_conn() as conn:
+        cursor = conn.cursor()
+        
+        # Total plants
+        cursor.execute('SELECT COUNT(*) as count FROM plants')
+        total = cursor.fetchone()['count']
+        
+        # By type
+        cursor.execute('SELECT type, COUNT(*) as count FROM plants GROUP BY type')
+        by_type = {row['type']: row['count'] for row in cursor.fetchall()}
+        
+        # By origin
+        cursor.execute('SELECT origin, COUNT(*) as count FROM plants GROUP BY origin')
+        by_origin = {row['origin']: row['count'] for row in cursor.fetchall()}
+        
+        # With warnings
+        cursor.execute('SELECT COUNT(*) as count FROM plants WHERE warning IS NOT NULL')
+        with_warnings = cursor.fetchone()['count']
+        
+        # Unique uses
+        cursor.execute('SELECT COUNT(DISTINCT use_name) as count FROM plant_uses')
+        unique_uses = cursor.fetchone()['count']
+    
+    return {
+        'total': total,
+        'byType': by_type,
+        'byOrigin': by_origin,
+        'withWarnings': with_warnings,
+        'uniqueUses': unique_uses
+    }
+
+
+@ttl_cached(maxsize=256, ttl=300, key=_path_key)
+def load_categories() -> List[Dict[str, Any]]:
+    """List plant categories with counts, largest first."""
+    with borrow_conn() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT type, COUNT(*) as count 
+            FROM plants 
+            GROUP BY type 
+            ORDER BY count DESC
+        ''')
+        
+        return [
+            {'name': row['type'], 'count': row['count']}
+            for row in cursor.fetchall()
+        ]
+
+
+@ttl_cached(maxsize=4096, ttl=60, key=lambda plant_id: (db_signature(), plant_id))
+def load_plant(plant_id: str) -> Optional[Dict[str, Any]]:
+    """Get complete plant details by ID."""
+    with borrow_conn() as conn:
+        return get_plant_details(conn, plant_id)
+
+
+# How long clients may reuse a conditional response before revalidating
+HTTP_MAX_AGE = 300
+
+def db_etag() -> str:
+    """Entity tag for data read from the database; changes whenever it is rebuilt."""
+    return '{}-{}'.format(*db_signature())
+
+
+def conditional(view):
+    """
+    Serve a view with an ETag tied to the database file.
     
-    # Get keywords
-    cursor.execute('SELECT keyword FROM keywords WHERE plant_id = ?', (plant_id,))
-    plant['keywords'] = [row['keyword'] for row in cursor.fetchall()]
+    Requests whose If-None-Match carries the current tag get an empty
+    304 without running the view. Only successful responses are tagged.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            etag = db_etag()
+        except OSError:
+            return view(*args, **kwargs)
+        
+        if etag in request.if_none_match:
+            resp = Response(status=304)
+        else:
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+        
+        resp.set_etag(etag)
+        resp.cache_control.public = True
+        resp.cache_control.max_age = HTTP_MAX_AGE
+        return resp
     
-    return plant
+    return wrapper
 
 
 @app.route('/api/plants', methods=['GET'])
@@ -78,82 +403,83 @@ def get_plants():
     - offset: Pagination offset
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Build query
-        query = 'SELECT * FROM plants WHERE 1=1'
-        params = []
-        
-        # Apply filters
-        plant_type = request.args.get('type')
-        if plant_type and plant_type != 'ALL':
-            query += ' AND type = ?'
-            params.append(plant_type)
-        
-        origin = request.args.get('origin')
-        if origin and origin != 'ALL':
-            query += ' AND origin = ?'
-            params.append(origin)
-        
-        region = request.args.get('region')
-        if region:
-            query += ' AND region LIKE ?'
-            params.append(f'%{region}%')
-        
-        has_warning = request.args.get('hasWarning')
-        if has_warning == 'true':
-            query += ' AND warning IS NOT NULL'
-        
-        min_nutrition = request.args.get('minNutrition')
-        if min_nutrition:
-            query += ' AND (nutritionScore >= ? OR efficacyScore >= ?)'
-            params.extend([float(min_nutrition), float(min_nutrition)])
-        
-        harvest_month = request.args.get('harvestMonth')
-        if harvest_month:
-            query += ''' AND id IN (
-                SELECT plant_id FROM harvest_months WHERE month = ?
-            )'''
-            params.append(int(harvest_month))
-        
-        # Full-text search
-        search = request.args.get('search')
-        if search:
-            query += ''' AND id IN (
-                SELECT id FROM plants_fts WHERE plants_fts MATCH ?
-            )'''
-            params.append(search)
-        
-        # Pagination
-        limit = request.args.get('limit', 100, type=int)
-        offset = request.args.get('offset', 0, type=int)
-        query += ' LIMIT ? OFFSET ?'
-        params.extend([limit, offset])
-        
-        # Execute query
-        cursor.execute(query, params)
-        plants = []
-        
-        for row in cursor.fetchall():
-            plant = get_plant_details(conn, row['id'])
-            if plant:
-                plants.append(plant)
-        
-        # Get total count
-        count_query = query.split('LIMIT')[0]
-        cursor.execute(f'SELECT COUNT(*) as count FROM ({count_query})', params[:-2])
-        total = cursor.fetchone()['count']
-        
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': plants,
-            'total': total,
-            'limit': limit,
-            'offset': offset
-        })
+        with borrow_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Build filter conditions
+            where = ''
+            params = []
+            
+            # Apply filters
+            plant_type = request.args.get('type')
+            if plant_type and plant_type != 'ALL':
+                where += ' AND type = ?'
+                params.append(plant_type)
+            
+            origin = request.args.get('origin')
+            if origin and origin != 'ALL':
+                where += ' AND origin = ?'
+                params.append(origin)
+            
+            region = request.args.get('region')
+            if region:
+                where += ' AND region LIKE ?'
+                params.append(f'%{region}%')
+            
+            has_warning = request.args.get('hasWarning')
+            if has_warning == 'true':
+                where += ' AND warning IS NOT NULL'
+            
+            min_nutrition = request.args.get('minNutrition')
+            if min_nutrition:
+                where += ' AND (nutritionScore >= ? OR efficacyScore >= ?)'
+                params.extend([float(min_nutrition), float(min_nutrition)])
+            
+            harvest_month = request.args.get('harvestMonth')
+            if harvest_month:
+                where += ''' AND id IN (
+                    SELECT plant_id FROM harvest_months WHERE month = ?
+                )'''
+                params.append(int(harvest_month))
+            
+            # Full-text search
+            search = request.args.get('search')
+            if search:
+                where += ''' AND id IN (
+                    SELECT id FROM plants_fts WHERE plants_fts MATCH ?
+                )'''
+                params.append(search)
+            
+            # Pagination; the window count returns the total number of matches
+            # alongside the page rows, so the filters are evaluated only once
+            limit = request.args.get('limit', 100, type=int)
+            offset = request.args.get('offset', 0, type=int)
+            query = f'''
+                SELECT json_object({PLANT_JSON_FIELDS}) AS payload, COUNT(*) OVER () AS _total
+                FROM plants p
+                WHERE 1=1{where}
+                ORDER BY p.rowid
+                LIMIT ? OFFSET ?
+            '''
+            
+            # Execute query
+            cursor.execute(query, params + [limit, offset])
+            rows = cursor.fetchall()
+            
+            if rows:
+                total = rows[0]['_total']
+            else:
+                # Empty page (past the end, limit=0, or no matches): no rows
+                # to read the total from
+                cursor.execute(f'SELECT COUNT(*) as count FROM plants WHERE 1=1{where}', params)
+                total = cursor.fetchone()['count']
+        
+        return json_rows_response(
+            [row['payload'] for row in rows],
+            total=total,
+            limit=limit,
+            offset=offset
+        )
         
     except Exception as e:
         return jsonify({
@@ -163,12 +489,11 @@ def get_plants():
 
 
 @app.route('/api/plants/<plant_id>', methods=['GET'])
+@conditional
 def get_plant(plant_id: str):
     """Get a single plant by ID."""
     try:
-        conn = get_db_connection()
-        plant = get_plant_details(conn, plant_id)
-        conn.close()
+        plant = load_plant(plant_id)
         
         if plant:
             return jsonify({
@@ -189,43 +514,13 @@ def get_plant(plant_id: str):
 
 
 @app.route('/api/stats', methods=['GET'])
+@conditional
 def get_stats():
     """Get database statistics."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Total plants
-        cursor.execute('SELECT COUNT(*) as count FROM plants')
-        total = cursor.fetchone()['count']
-        
-        # By type
-        cursor.execute('SELECT type, COUNT(*) as count FROM plants GROUP BY type')
-        by_type = {row['type']: row['count'] for row in cursor.fetchall()}
-        
-        # By origin
-        cursor.execute('SELECT origin, COUNT(*) as count FROM plants GROUP BY origin')
-        by_origin = {row['origin']: row['count'] for row in cursor.fetchall()}
-        
-        # With warnings
-        cursor.execute('SELECT COUNT(*) as count FROM plants WHERE warning IS NOT NULL')
-        with_warnings = cursor.fetchone()['count']
-        
-        # Unique uses
-        cursor.execute('SELECT COUNT(DISTINCT use_name) as count FROM plant_uses')
-        unique_uses = cursor.fetchone()['count']
-        
-        conn.close()
-        
         return jsonify({
             'success': True,
-            'data': {
-                'total': total,
-                'byType': by_type,
-                'byOrigin': by_origin,
-                'withWarnings': with_warnings,
-                'uniqueUses': unique_uses
-            }
+            'data': load_stats()
         })
         
     except Exception as e:
@@ -237,7 +532,12 @@ def get_stats():
 
 @app.route('/api/search', methods=['GET'])
 def search_plants():
-    """Full-text search across plants."""
+    """
+    Full-text search across plants.
+    
+    Results are ordered by relevance; each plant carries a 'score' field
+    (higher is more relevant) that the client can use to render ranking.
+    """
     query = request.args.get('q', '')
     
     if not query:
@@ -247,28 +547,30 @@ def search_plants():
         }), 400
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Full-text search
-        cursor.execute('''
-            SELECT id FROM plants_fts 
-            WHERE plants_fts MATCH ? 
-            ORDER BY rank
-            LIMIT 50
-        ''', (query,))
-        
-        plant_ids = [row['id'] for row in cursor.fetchall()]
-        plants = [get_plant_details(conn, pid) for pid in plant_ids]
-        plants = [p for p in plants if p]  # Filter out None values
-        
-        conn.close()
+        with borrow_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Full-text search ranked by column-weighted bm25 and joined back
+            # to plants, with each result encoded as JSON by SQLite. Weights
+            # follow the plants_fts column order: id, name, scientificName,
+            # description, detailedInfo, region, keywords_json. bm25() is
+            # negative (lower is better), so it is negated into a relevance score.
+            cursor.execute(f'''
+                SELECT json_object({PLANT_JSON_FIELDS}, 'score', p.score) AS payload
+                FROM (
+                    SELECT plants.*, -bm25(plants_fts, 0.0, 10.0, 8.0, 1.0, 1.0, 2.0, 5.0) AS score
+                    FROM plants_fts
+                    JOIN plants ON plants.id = plants_fts.id
+                    WHERE plants_fts MATCH ?
+                    ORDER BY score DESC
+                    LIMIT 50
+                ) AS p
+                ORDER BY p.score DESC
+            ''', (query,))
+            
+            payloads = [row['payload'] for row in cursor.fetchall()]
         
-        return jsonify({
-            'success': True,
-            'data': plants,
-            'total': len(plants)
-        })
+        return json_rows_response(payloads, total=len(payloads))
         
     except Exception as e:
         return jsonify({
@@ -278,29 +580,13 @@ def search_plants():
 
 
 @app.route('/api/categories', methods=['GET'])
+@conditional
 def get_categories():
     """Get all plant categories with counts."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT type, COUNT(*) as count 
-            FROM plants 
-            GROUP BY type 
-            ORDER BY count DESC
-        ''')
-        
-        categories = [
-            {'name': row['type'], 'count': row['count']}
-            for row in cursor.fetchall()
-        ]
-        
-        conn.close()
-        
         return jsonify({
             'success': True,
-            'data': categories
+            'data': load_categories()
         })
         
     except Exception as e:
@@ -314,11 +600,10 @@ def get_categories():
 def health_check():
     """Health check endpoint."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) as count FROM plants')
-        count = cursor.fetchone()['count']
-        conn.close()
+        with borrow_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) as count FROM plants')
+            count = cursor.fetchone()['count']
         
         return jsonify({
             'success': True,
@@ -356,4 +641,15 @@ if __name__ == '__main__':
     print("  GET /api/health - Health check")
     print("\n" + "="*60 + "\n")
     
-    app.run(debug=True, port=5000)
+    # Serve with waitress when available: a multi-threaded WSGI server with one
+    # worker thread per pooled connection. Pass --debug for Flask's reloader
+    # and debugger instead.
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    
+    if serve is None or '--debug' in sys.argv:
+        app.run(debug=True, port=5000, threaded=True)
+    else:
+        serve(app, host='127.0.0.1', port=5000, threads=POOL_SIZE)
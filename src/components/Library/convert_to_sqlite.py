@@ -4,18 +4,114 @@ Botanical Library Data Converter
 Converts JavaScript data.js to SQLite database with improved parsing and validation.
 """
 
+import hashlib
 import sqlite3
 import json
+import mmap
+import multiprocessing
+import os
+import pickle
 import re
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import json5
+except ImportError:  # Optional: falls back to the built-in JS parser
+    json5 = None
+
+
+# Imports at least this large validate plants in a process pool; below it,
+# starting worker processes costs more than it saves
+PARALLEL_MIN_PLANTS = 5000
+
+# Length of the hex digest of data.js stored at the start of the parse cache
+CACHE_KEY_SIZE = 32
+
+# Bump whenever extract_js_data's output changes, so older parse caches are
+# rebuilt instead of being reused
+PARSER_VERSION = 1
+
+# Tries, and seconds between them, at swapping the rebuilt database in while
+# another process (the API server, on Windows) still has the old one open
+REPLACE_ATTEMPTS = 15
+REPLACE_DELAY = 2.0
+
+# Columns of a plant row, in the order normalize_plant builds them
+PLANT_COLUMNS = (
+    'id', 'name', 'scientificName', 'type', 'origin', 'color',
+    'nutritionScore', 'efficacyScore', 'commercialValue',
+    'description', 'detailedInfo', 'region', 'spacing',
+    'climate', 'soilType', 'warning', 'severity',
+    'uses_json', 'harvest_months_json', 'certification_json', 'keywords_json'
+)
+
+# Plant columns declared NOT NULL in the schema
+PLANT_REQUIRED_COLUMNS = frozenset({
+    'id', 'name', 'type', 'origin',
+    'uses_json', 'harvest_months_json', 'certification_json', 'keywords_json'
+})
+
+# Python types sqlite3 can bind as a column value
+SQLITE_VALUE_TYPES = (str, int, float, type(None))
+
+# Rows built for one plant: (plant_row, use_rows, month_rows)
+PlantRows = Tuple[tuple, List[tuple], List[tuple]]
+
+# Start of the data array: const allItems = [ / const data = [ / export const data = [
+_ARRAY_HEADER_RE = re.compile(rb'(?:export\s+)?const\s+(?:allItems|data)\s*=\s*\[')
+
+# Tokens that matter when matching the array's closing bracket
+_ARRAY_TOKEN_RE = re.compile(
+    rb'"(?:\\.|[^"\\])*"'   # double-quoted string
+    rb"|'(?:\\.|[^'\\])*'"  # single-quoted string
+    rb'|//[^\n]*'            # line comment
+    rb'|/\*.*?\*/'           # block comment
+    rb'|[\[\]]',
+    re.DOTALL
+)
+
+# Fallback JS object parser patterns
+_COMMENT_LINE = re.compile(r'//.*?$', re.MULTILINE)
+_COMMENT_BLOCK = re.compile(r'/\*.*?\*/', re.DOTALL)
+_BRACE_RE = re.compile(r'[{}]')
+_ARRAY_RE = re.compile(r'\[(.*?)\]', re.DOTALL)
+# key: value (handling strings, arrays, numbers, etc.)
+_KV_RE = re.compile(r'(\w+)\s*:\s*(.+?)(?=,\s*\w+\s*:|$)', re.DOTALL)
+
+
+def find_array_end(buffer, start: int) -> int:
+    """
+    Find the index of the ']' that closes the array opened at buffer[start].
+    
+    Only brackets, strings and comments are visited (via one compiled regex),
+    so brackets inside string values or comments are ignored.
+    
+    Raises:
+        ValueError: If the array is never closed
+    """
+    depth = 0
+    for match in _ARRAY_TOKEN_RE.finditer(buffer, start):
+        token = match.group()
+        if token == b'[':
+            depth += 1
+        elif token == b']':
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    raise ValueError("Unterminated data array in JS file")
 
 
 def extract_js_data(js_file_path: str) -> List[Dict[str, Any]]:
     """
     Extract the data array from the JavaScript file using improved parsing.
     
+    The file is memory-mapped and scanned once: the array header is located
+    with a single regex search and its closing bracket by a depth counter,
+    so no full-file string copy is made.
+    
     Args:
         js_file_path: Path to the JavaScript file
         
@@ -27,81 +123,114 @@ def extract_js_data(js_file_path: str) -> List[Dict[str, Any]]:
     """
     print(f"Reading JavaScript file: {js_file_path}")
     
-    with open(js_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find the data array with better regex - try multiple patterns
-    patterns = [
-        r'const\s+allItems\s*=\s*\[(.*?)\];',  # const allItems = [...]
-        r'const\s+data\s*=\s*\[(.*?)\];',      # const data = [...]
-        r'export\s+const\s+data\s*=\s*\[(.*?)\]',  # export const data = [...]
-    ]
-    
-    match = None
-    for pattern in patterns:
-        match = re.search(pattern, content, re.DOTALL)
-        if match:
-            break
-    
-    if not match:
+    if Path(js_file_path).stat().st_size == 0:
         raise ValueError("Could not find data array in JS file (tried: allItems, data)")
     
-    array_content = match.group(1).strip()
+    with open(js_file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = _ARRAY_HEADER_RE.search(mm)
+        if not header:
+            raise ValueError("Could not find data array in JS file (tried: allItems, data)")
+        
+        array_start = header.end() - 1  # Position of the opening '['
+        array_end = find_array_end(mm, array_start)
+        array_bytes = mm[array_start:array_end + 1]
     
     # Try JSON parsing first (if data is already in JSON format)
     try:
-        json_str = '[' + array_content + ']'
-        plants = json.loads(json_str)
+        plants = json.loads(array_bytes)
         print(f"Successfully parsed {len(plants)} plant entries using JSON parser")
         return plants
     except json.JSONDecodeError:
         print("JSON parsing failed, using JavaScript parser...")
         # Fallback to manual parser for JavaScript syntax
+        array_content = array_bytes[1:-1].decode('utf-8').strip()
         plants = parse_js_objects(array_content)
         print(f"Successfully parsed {len(plants)} plant entries using JS parser")
         return plants
 
 
+def load_plants_data(js_file_path: str, cache_path: str) -> List[Dict[str, Any]]:
+    """
+    Extract plant data, reusing the parse cache while the JS file is unchanged.
+    
+    The cache file starts with a hex blake2b digest of the JS file, the parser
+    version and which parser (json5 or built-in) is available, followed by
+    the pickled plant list. A missing, stale or unreadable cache is rebuilt.
+    
+    Args:
+        js_file_path: Path to the JavaScript file
+        cache_path: Path to the parse cache file
+        
+    Returns:
+        List of plant dictionaries
+    """
+    digest = hashlib.blake2b(digest_size=CACHE_KEY_SIZE // 2)
+    with open(js_file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(f'{PARSER_VERSION}:{json5 is not None}'.encode())
+    key = digest.hexdigest().encode()
+    
+    cache = Path(cache_path)
+    if cache.exists():
+        blob = cache.read_bytes()
+        if blob[:CACHE_KEY_SIZE] == key:
+            try:
+                plants = pickle.loads(blob[CACHE_KEY_SIZE:])
+                print(f"Loaded {len(plants)} plant entries from parse cache: {cache_path}")
+                return plants
+            except Exception as e:
+                print(f"Warning: Ignoring unreadable parse cache: {e}")
+    
+    plants = extract_js_data(js_file_path)
+    if plants:
+        cache.write_bytes(key + pickle.dumps(plants, protocol=pickle.HIGHEST_PROTOCOL))
+    return plants
+
+
 def parse_js_objects(content: str) -> List[Dict[str, Any]]:
     """
     Parse JavaScript object literals into Python dictionaries.
     Handles nested objects, arrays, strings with quotes, and comments.
     
+    Uses json5 when it is installed, which parses the whole array in a
+    single pass; otherwise falls back to the built-in object scanner.
+    
     Args:
         content: JavaScript array content (without outer brackets)
         
     Returns:
         List of parsed plant dictionaries
     """
+    if json5 is not None:
+        try:
+            parsed = json5.loads('[' + content + ']')
+            return [obj for obj in parsed if isinstance(obj, dict) and 'id' in obj]
+        except ValueError as e:
+            print(f"json5 parsing failed ({e}), using built-in parser...")
+    
     plants = []
-    current_obj = {}
-    stack = []
-    i = 0
     
     # Remove comments
-    content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+    content = _COMMENT_LINE.sub('', content)
+    content = _COMMENT_BLOCK.sub('', content)
     
-    # Split into individual objects by finding balanced braces
+    # Split into individual objects by finding balanced braces. Only the
+    # braces are visited (via the regex engine); bodies are sliced out whole
     obj_strings = []
-    brace_count = 0
-    current_obj_str = ""
-    
-    for char in content:
-        if char == '{':
-            if brace_count == 0:
-                current_obj_str = "{"
-            else:
-                current_obj_str += char
-            brace_count += 1
-        elif char == '}':
-            brace_count -= 1
-            current_obj_str += char
-            if brace_count == 0 and current_obj_str.strip():
-                obj_strings.append(current_obj_str)
-                current_obj_str = ""
-        elif brace_count > 0:
-            current_obj_str += char
+    depth = 0
+    start = 0
+    
+    for match in _BRACE_RE.finditer(content):
+        if match.group() == '{':
+            if depth == 0:
+                start = match.start()
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                obj_strings.append(content[start:match.end()])
     
     # Parse each object
     for obj_str in obj_strings:
@@ -124,10 +253,7 @@ def parse_single_object(obj_str: str) -> Dict[str, Any]:
     obj_str = obj_str.strip()[1:-1]
     
     # Find all key-value pairs
-    # Pattern matches: key: value (handling strings, arrays, numbers, etc.)
-    pattern = r'(\w+)\s*:\s*(.+?)(?=,\s*\w+\s*:|$)'
-    
-    matches = re.finditer(pattern, obj_str, re.DOTALL)
+    matches = _KV_RE.finditer(obj_str)
     
     for match in matches:
         key = match.group(1).strip()
@@ -147,7 +273,7 @@ def parse_value(value_str: str) -> Any:
     # Array
     if value_str.startswith('['):
         # Extract array content
-        array_match = re.match(r'\[(.*?)\]', value_str, re.DOTALL)
+        array_match = _ARRAY_RE.match(value_str)
         if array_match:
             array_content = array_match.group(1)
             # Split by comma, handling quoted strings
@@ -202,7 +328,10 @@ def parse_value(value_str: str) -> Any:
 
 def create_database(db_path: str) -> sqlite3.Connection:
     """
-    Create SQLite database with optimized schema and indexes.
+    Create SQLite database tables.
+    
+    Indexes and the full-text search table are created by create_indexes()
+    after the data has been inserted.
     
     Args:
         db_path: Path to the SQLite database file
@@ -216,7 +345,7 @@ def create_database(db_path: str) -> sqlite3.Connection:
     db_file = Path(db_path)
     if db_file.exists():
         db_file.unlink()
-        print("Removed existing database")
+        print(f"Removed existing {db_file.name}")
     
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -244,16 +373,15 @@ def create_database(db_path: str) -> sqlite3.Connection:
             soilType TEXT,
             warning TEXT,
             severity TEXT,
+            -- Related lists as JSON arrays, so reads need no joins
+            uses_json TEXT NOT NULL DEFAULT '[]',
+            harvest_months_json TEXT NOT NULL DEFAULT '[]',
+            certification_json TEXT NOT NULL DEFAULT '[]',
+            keywords_json TEXT NOT NULL DEFAULT '[]',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
     
-    # Create indexes for common queries
-    cursor.execute('CREATE INDEX idx_plants_type ON plants(type)')
-    cursor.execute('CREATE INDEX idx_plants_origin ON plants(origin)')
-    cursor.execute('CREATE INDEX idx_plants_region ON plants(region)')
-    cursor.execute('CREATE INDEX idx_plants_name ON plants(name)')
-    
     # Create uses table (many-to-many relationship)
     cursor.execute('''
         CREATE TABLE plant_uses (
@@ -263,8 +391,6 @@ def create_database(db_path: str) -> sqlite3.Connection:
             FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
         )
     ''')
-    cursor.execute('CREATE INDEX idx_uses_plant_id ON plant_uses(plant_id)')
-    cursor.execute('CREATE INDEX idx_uses_name ON plant_uses(use_name)')
     
     # Create harvest months table
     cursor.execute('''
@@ -275,33 +401,45 @@ def create_database(db_path: str) -> sqlite3.Connection:
             FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
         )
     ''')
-    cursor.execute('CREATE INDEX idx_harvest_plant_id ON harvest_months(plant_id)')
-    cursor.execute('CREATE INDEX idx_harvest_month ON harvest_months(month)')
     
-    # Create certifications table
-    cursor.execute('''
-        CREATE TABLE certifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            plant_id TEXT NOT NULL,
-            certification TEXT NOT NULL,
-            FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
-        )
-    ''')
-    cursor.execute('CREATE INDEX idx_cert_plant_id ON certifications(plant_id)')
+    conn.commit()
+    print("Database schema created successfully")
+    return conn
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create indexes and the full-text search table once the data is loaded.
     
-    # Create keywords table for search
-    cursor.execute('''
-        CREATE TABLE keywords (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            plant_id TEXT NOT NULL,
-            keyword TEXT NOT NULL,
-            FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
-        )
-    ''')
-    cursor.execute('CREATE INDEX idx_keywords_plant_id ON keywords(plant_id)')
-    cursor.execute('CREATE INDEX idx_keywords_keyword ON keywords(keyword)')
+    Building an index over a full table is cheaper than maintaining it across
+    every insert. Also gathers planner statistics and switches the database
+    from bulk-load settings back to a rollback journal, which both the API
+    server and the sql.js browser build can open.
     
-    # Create full-text search virtual table
+    Args:
+        conn: SQLite connection object
+    """
+    print("Creating indexes...")
+    cursor = conn.cursor()
+    
+    # Indexes for common queries
+    # type / origin / minNutrition filters share one composite index
+    cursor.execute('CREATE INDEX idx_plants_type_origin ON plants(type, origin, nutritionScore)')
+    cursor.execute('CREATE INDEX idx_plants_origin ON plants(origin)')
+    cursor.execute('CREATE INDEX idx_plants_region ON plants(region)')
+    cursor.execute('CREATE INDEX idx_plants_name ON plants(name)')
+    
+    cursor.execute('CREATE INDEX idx_uses_plant_id ON plant_uses(plant_id)')
+    cursor.execute('CREATE INDEX idx_uses_name ON plant_uses(use_name)')
+    
+    cursor.execute('CREATE INDEX idx_harvest_plant_id ON harvest_months(plant_id)')
+    # Covers the harvestMonth filter subquery (month -> plant_id) as an index-only scan
+    cursor.execute('CREATE INDEX idx_harvest_month_plant ON harvest_months(month, plant_id)')
+    
+    # Full-text search virtual table. It is an external-content table over
+    # plants: build its index from the loaded rows in one pass, then merge it
+    # into a single segment. Keywords are indexed straight from keywords_json;
+    # the tokenizer treats the JSON punctuation as separators
     cursor.execute('''
         CREATE VIRTUAL TABLE plants_fts USING fts5(
             id UNINDEXED,
@@ -310,128 +448,190 @@ def create_database(db_path: str) -> sqlite3.Connection:
             description,
             detailedInfo,
             region,
+            keywords_json,
             content=plants
         )
     ''')
+    cursor.execute("INSERT INTO plants_fts(plants_fts) VALUES('rebuild')")
+    cursor.execute("INSERT INTO plants_fts(plants_fts) VALUES('optimize')")
+    conn.commit()
     
+    # Gather statistics so the query planner picks the composite indexes
+    cursor.execute('ANALYZE')
     conn.commit()
-    print("Database schema created successfully")
-    return conn
+    
+    # Back to durable settings for normal use. The file is also served to the
+    # browser, and sql.js cannot open WAL databases
+    cursor.execute('PRAGMA locking_mode = NORMAL')
+    cursor.execute('PRAGMA journal_mode = DELETE')
+    cursor.execute('PRAGMA synchronous = NORMAL')
+    print("Indexes created successfully")
+
+
+def normalize_plant(plant: Dict[str, Any]) -> Optional[PlantRows]:
+    """
+    Validate one plant and build its rows for every table.
+    
+    Top-level so it can run in worker processes.
+    
+    Args:
+        plant: Plant dictionary from data.js
+        
+    Returns:
+        (plant_row, use_rows, month_rows), or None if the
+        plant has no ID
+        
+    Raises:
+        ValueError: If a NOT NULL column is null or a value cannot be stored
+    """
+    plant_id = plant.get('id')
+    if not plant_id:
+        return None
+    
+    # Related lists, validated once and stored both as JSON columns on
+    # plants (read side) and in child tables (filters and statistics)
+    uses = plant.get('uses', [])
+    uses = [str(use) for use in uses if use] if isinstance(uses, list) else []
+    
+    harvest_months = plant.get('harvestMonths', [])
+    harvest_months = sorted(
+        month for month in harvest_months
+        if isinstance(month, int) and 1 <= month <= 12
+    ) if isinstance(harvest_months, list) else []
+    
+    certifications = plant.get('certification', [])
+    certifications = [
+        str(cert) for cert in certifications if cert
+    ] if isinstance(certifications, list) else []
+    
+    keywords = plant.get('keywords', [])
+    keywords = [
+        str(keyword) for keyword in keywords if keyword
+    ] if isinstance(keywords, list) else []
+    
+    plant_row = (
+        plant_id,
+        plant.get('name', ''),
+        plant.get('scientificName', ''),
+        plant.get('type', ''),
+        plant.get('origin', ''),
+        plant.get('color', ''),
+        plant.get('nutritionScore'),
+        plant.get('efficacyScore'),
+        plant.get('commercialValue', ''),
+        plant.get('description', ''),
+        plant.get('detailedInfo', ''),
+        plant.get('region', ''),
+        plant.get('spacing', ''),
+        plant.get('climate', ''),
+        plant.get('soilType', ''),
+        plant.get('warning'),
+        plant.get('severity'),
+        json.dumps(uses, ensure_ascii=False),
+        json.dumps(harvest_months),
+        json.dumps(certifications, ensure_ascii=False),
+        json.dumps(keywords, ensure_ascii=False)
+    )
+    
+    # Reject values SQLite would refuse at insert time, so a bad record is
+    # reported and skipped here instead of aborting the batched insert
+    for column, value in zip(PLANT_COLUMNS, plant_row):
+        if value is None and column in PLANT_REQUIRED_COLUMNS:
+            raise ValueError(f"{column} is required")
+        if not isinstance(value, SQLITE_VALUE_TYPES):
+            raise ValueError(f"{column} has unsupported type {type(value).__name__}")
+        if isinstance(value, int) and not -2**63 <= value < 2**63:
+            raise ValueError(f"{column} is out of range for an SQLite integer")
+    
+    use_rows = [(plant_id, use) for use in uses]
+    month_rows = [(plant_id, month) for month in harvest_months]
+    
+    return plant_row, use_rows, month_rows
+
+
+def _normalize_plant_safe(plant: Dict[str, Any]) -> Tuple[Optional[PlantRows], Optional[str]]:
+    """Run normalize_plant, returning the error message instead of raising."""
+    try:
+        return normalize_plant(plant), None
+    except Exception as e:
+        return None, str(e)
+
 
 def insert_plant_data(conn: sqlite3.Connection, plants_data: List[Dict[str, Any]]) -> None:
     """
     Insert plant data into the database with validation and error handling.
     
+    Rows are validated and collected per table first, then written with one
+    executemany per table inside a single transaction. Plants that fail
+    validation (including values SQLite would reject) are reported and skipped.
+    
     Args:
         conn: SQLite connection object
         plants_data: List of plant dictionaries
     """
     cursor = conn.cursor()
-    inserted_count = 0
     error_count = 0
     
     print(f"Inserting {len(plants_data)} plants...")
     
-    for i, plant in enumerate(plants_data, 1):
-        try:
-            plant_id = plant.get('id')
-            if not plant_id:
-                print(f"Warning: Plant #{i} missing ID, skipping")
-                error_count += 1
-                continue
-            
-            # Insert main plant data
-            cursor.execute('''
-                INSERT OR REPLACE INTO plants (
-                    id, name, scientificName, type, origin, color,
-                    nutritionScore, efficacyScore, commercialValue,
-                    description, detailedInfo, region, spacing,
-                    climate, soilType, warning, severity
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                plant_id,
-                plant.get('name', ''),
-                plant.get('scientificName', ''),
-                plant.get('type', ''),
-                plant.get('origin', ''),
-                plant.get('color', ''),
-                plant.get('nutritionScore'),
-                plant.get('efficacyScore'),
-                plant.get('commercialValue', ''),
-                plant.get('description', ''),
-                plant.get('detailedInfo', ''),
-                plant.get('region', ''),
-                plant.get('spacing', ''),
-                plant.get('climate', ''),
-                plant.get('soilType', ''),
-                plant.get('warning'),
-                plant.get('severity')
-            ))
-            
-            # Insert uses
-            uses = plant.get('uses', [])
-            if isinstance(uses, list):
-                for use in uses:
-                    if use:
-                        cursor.execute(
-                            'INSERT INTO plant_uses (plant_id, use_name) VALUES (?, ?)',
-                            (plant_id, str(use))
-                        )
-            
-            # Insert harvest months
-            harvest_months = plant.get('harvestMonths', [])
-            if isinstance(harvest_months, list):
-                for month in harvest_months:
-                    if isinstance(month, int) and 1 <= month <= 12:
-                        cursor.execute(
-                            'INSERT INTO harvest_months (plant_id, month) VALUES (?, ?)',
-                            (plant_id, month)
-                        )
-            
-            # Insert certifications
-            certifications = plant.get('certification', [])
-            if isinstance(certifications, list):
-                for cert in certifications:
-                    if cert:
-                        cursor.execute(
-                            'INSERT INTO certifications (plant_id, certification) VALUES (?, ?)',
-                            (plant_id, str(cert))
-                        )
-            
-            # Insert keywords
-            keywords = plant.get('keywords', [])
-            if isinstance(keywords, list):
-                for keyword in keywords:
-                    if keyword:
-                        cursor.execute(
-                            'INSERT INTO keywords (plant_id, keyword) VALUES (?, ?)',
-                            (plant_id, str(keyword))
-                        )
-            
-            # Insert into FTS table
-            cursor.execute('''
-                INSERT INTO plants_fts (id, name, scientificName, description, detailedInfo, region)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                plant_id,
-                plant.get('name', ''),
-                plant.get('scientificName', ''),
-                plant.get('description', ''),
-                plant.get('detailedInfo', ''),
-                plant.get('region', '')
-            ))
-            
-            inserted_count += 1
-            
-            if i % 10 == 0:
-                print(f"  Processed {i}/{len(plants_data)} plants...")
-                
-        except Exception as e:
-            print(f"Error inserting plant {plant.get('id', 'unknown')}: {e}")
+    # Bulk-load settings: the database is rebuilt from scratch on every run,
+    # so durability during the import is not needed (restored in create_indexes)
+    cursor.execute('PRAGMA journal_mode = OFF')
+    cursor.execute('PRAGMA synchronous = OFF')
+    cursor.execute('PRAGMA locking_mode = EXCLUSIVE')
+    cursor.execute('PRAGMA cache_size = -200000')  # ~200 MB
+    
+    # Collected rows per plant ID; a later duplicate replaces an earlier one
+    # (and its related rows), matching INSERT OR REPLACE semantics
+    collected = {}
+    
+    # Validation is pure Python, so large imports fan it out to worker
+    # processes; SQLite writes stay in this process
+    if len(plants_data) >= PARALLEL_MIN_PLANTS:
+        with multiprocessing.Pool() as pool:
+            results = pool.map(_normalize_plant_safe, plants_data, chunksize=64)
+    else:
+        results = [_normalize_plant_safe(plant) for plant in plants_data]
+    
+    for i, (plant, (normalized, error)) in enumerate(zip(plants_data, results), 1):
+        if error:
+            print(f"Error inserting plant {plant.get('id', 'unknown')}: {error}")
             error_count += 1
             continue
-    
+        
+        if normalized is None:
+            print(f"Warning: Plant #{i} missing ID, skipping")
+            error_count += 1
+            continue
+        
+        plant_id = normalized[0][0]
+        collected.pop(plant_id, None)
+        collected[plant_id] = normalized
+        
+        if i % 10 == 0:
+            print(f"  Processed {i}/{len(plants_data)} plants...")
+    
+    plant_rows = [entry[0] for entry in collected.values()]
+    use_rows = [row for entry in collected.values() for row in entry[1]]
+    month_rows = [row for entry in collected.values() for row in entry[2]]
+    
+    cursor.execute('BEGIN')
+    cursor.executemany(
+        f"INSERT OR REPLACE INTO plants ({', '.join(PLANT_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(PLANT_COLUMNS))})",
+        plant_rows
+    )
+    cursor.executemany(
+        'INSERT INTO plant_uses (plant_id, use_name) VALUES (?, ?)',
+        use_rows
+    )
+    cursor.executemany(
+        'INSERT INTO harvest_months (plant_id, month) VALUES (?, ?)',
+        month_rows
+    )
     conn.commit()
+    
+    inserted_count = len(plants_data) - error_count
     print(f"Successfully inserted {inserted_count} plants ({error_count} errors)")
 
 def print_statistics(conn: sqlite3.Connection) -> None:
@@ -476,19 +676,54 @@ def print_statistics(conn: sqlite3.Connection) -> None:
     print(f"Unique uses: {uses}")
     
     # Total keywords
-    cursor.execute("SELECT COUNT(DISTINCT keyword) FROM keywords")
+    cursor.execute("SELECT COUNT(DISTINCT value) FROM plants, json_each(plants.keywords_json)")
     keywords = cursor.fetchone()[0]
     print(f"Unique keywords: {keywords}")
     
     print("="*60 + "\n")
 
 
+def replace_database(built: Path, target: Path) -> None:
+    """
+    Swap a freshly built database in over the existing one.
+    
+    The rename is atomic, so a running API server serves the old file until
+    the switch and then reopens the new one. Windows refuses it while the
+    old file is open; the server closes connections left idle for a few
+    seconds, so the swap is retried for a while before giving up.
+    
+    Args:
+        built: Path of the new database
+        target: Path the database is served from
+    """
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            # Drop WAL side files left behind by builds that used WAL mode;
+            # SQLite would otherwise replay them into the new file
+            for suffix in ('-wal', '-shm'):
+                side_file = Path(str(target) + suffix)
+                if side_file.exists():
+                    side_file.unlink()
+            os.replace(built, target)
+            return
+        except PermissionError:
+            if attempt == 0:
+                print(f"{target.name} is in use, waiting for it to be released...")
+            time.sleep(REPLACE_DELAY)
+    
+    raise RuntimeError(
+        f"{target} is still in use; stop the API server and run the converter again"
+    )
+
+
 def main():
     """Main execution function."""
     # File paths
     script_dir = Path(__file__).parent
     js_file = script_dir / 'data.js'
     db_file = script_dir / 'botanical_library.db'
+    build_file = script_dir / 'botanical_library.db.tmp'
+    cache_file = script_dir / 'data.cache.pickle'
     
     print("="*60)
     print("BOTANICAL LIBRARY DATA CONVERTER")
@@ -505,25 +740,30 @@ def main():
         sys.exit(1)
     
     try:
-        # Extract data from JavaScript file
-        plants_data = extract_js_data(str(js_file))
+        # Extract data from JavaScript file (or its parse cache)
+        plants_data = load_plants_data(str(js_file), str(cache_file))
         
         if not plants_data:
             print("ERROR: No plant data found in JavaScript file")
             sys.exit(1)
         
-        # Create database
-        conn = create_database(str(db_file))
+        # Create database (under a temporary name until it is complete)
+        conn = create_database(str(build_file))
         
         # Insert data
         insert_plant_data(conn, plants_data)
         
+        # Create indexes
+        create_indexes(conn)
+        
         # Print statistics
         print_statistics(conn)
         
         # Close connection
         conn.close()
         
+        replace_database(build_file, db_file)
+        
         print(f"✓ Database created successfully: {db_file}")
         print(f"✓ Database size: {db_file.stat().st_size / 1024:.2f} KB")
         
@@ -12,14 +12,29 @@ Fontes: Wikipedia/Wikimedia → iNaturalist
 import json
 import re
 import os
+import random
 import sys
+import threading
+import time
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from requests_cache import CachedSession
+except ImportError:  # Opcional: sem requests-cache, as respostas não são guardadas em disco
+    CachedSession = None
+
+try:
+    import orjson
+except ImportError:  # Opcional: sem orjson, as respostas são lidas com o json padrão
+    orjson = None
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import quote, urlparse
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
-from functools import partial
 
 # Configurar logging
 logging.basicConfig(
@@ -28,6 +43,178 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Validade das respostas das APIs guardadas no cache em disco
+CACHE_EXPIRE_AFTER = timedelta(days=30)
+
+# Novas tentativas após HTTP 429 e espera base (dobrada a cada tentativa)
+# quando a resposta não traz Retry-After
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# Pontuação do Wikimedia a partir da qual o iNaturalist não é consultado
+CONFIDENT_SCORE = 8
+
+# Termos botânicos que indicam uma imagem relevante no título ou na descrição
+_BOTANY_TERMS = re.compile(r'plant|flower|leaf|fruit|tree', re.IGNORECASE)
+
+# Array de dados no arquivo JavaScript: const data = [ ... ];
+_DATA_ARRAY_RE = re.compile(r'const data = \[(.*?)\];', re.DOTALL)
+
+# Arquivo inteiro no formato gerado por save_updated_file, em que o array já é JSON:
+# const allItems = [ ... ]; export default allItems;
+_JSON_MODULE_RE = re.compile(
+    r'\s*(?:const|var|let)\s+\w+\s*=\s*(\[.*\])\s*;?\s*(?:export .*)?$', re.DOTALL
+)
+
+
+def _json_sidecar_path(js_path):
+    """Caminho do arquivo .json gravado ao lado de um arquivo de dados .js"""
+    return os.path.splitext(js_path)[0] + '.json'
+
+
+def _js_to_json(content):
+    """
+    Converte um trecho de JavaScript (objetos literais) em JSON numa única passada.
+
+    Remove comentários de linha e de bloco, coloca aspas nas chaves sem aspas
+    e troca strings com aspas simples por aspas duplas. O conteúdo de strings
+    é copiado sem alterações, então dois pontos e barras dentro de valores
+    não são confundidos com chaves ou comentários.
+    """
+    out = []
+    i = 0
+    n = len(content)
+
+    while i < n:
+        c = content[i]
+
+        if c == '"':
+            # String com aspas duplas: copiar até a aspa de fechamento
+            # (uma aspa precedida de número ímpar de barras está escapada)
+            j = content.find('"', i + 1)
+            while j != -1:
+                k = j
+                while content[k - 1] == '\\':
+                    k -= 1
+                if (j - k) % 2 == 0:
+                    break
+                j = content.find('"', j + 1)
+            j = n if j == -1 else j
+            out.append(content[i:j + 1])
+            i = j + 1
+
+        elif c == "'":
+            # String com aspas simples: reescrever com aspas duplas
+            out.append('"')
+            j = i + 1
+            while j < n and content[j] != "'":
+                ch = content[j]
+                if ch == '\\' and j + 1 < n:
+                    nxt = content[j + 1]
+                    # \' não precisa de escape em JSON; demais escapes são mantidos
+                    out.append("'" if nxt == "'" else ch + nxt)
+                    j += 2
+                    continue
+                out.append('\\"' if ch == '"' else ch)
+                j += 1
+            out.append('"')
+            i = j + 1
+
+        elif c == '/' and i + 1 < n and content[i + 1] == '/':
+            # Comentário de linha: pular até o fim da linha
+            j = content.find('\n', i)
+            i = n if j == -1 else j
+
+        elif c == '/' and i + 1 < n and content[i + 1] == '*':
+            # Comentário de bloco: pular até o */
+            j = content.find('*/', i + 2)
+            i = n if j == -1 else j + 2
+
+        elif c.isalpha() or c == '_' or c == '$':
+            # Identificador: vira chave com aspas se for seguido de dois pontos
+            j = i + 1
+            while j < n and (content[j].isalnum() or content[j] in '_$'):
+                j += 1
+            k = j
+            while k < n and content[k] in ' \t\r\n':
+                k += 1
+            if k < n and content[k] == ':':
+                out.append(f'"{content[i:j]}"')
+            else:
+                out.append(content[i:j])
+            i = j
+
+        else:
+            out.append(c)
+            i += 1
+
+    return ''.join(out)
+
+
+def _json(response):
+    """Corpo JSON de uma resposta da API, lido com orjson quando disponível"""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            # Mesma exceção de response.json(), para que os chamadores que
+            # tratam requests.RequestException continuem a capturá-la
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response) from e
+    return response.json()
+
+
+def _json_line(obj):
+    """Objeto codificado como uma linha de JSON (NDJSON), em bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _retry_after_seconds(response):
+    """Segundos pedidos pelo cabeçalho Retry-After (número ou data HTTP), ou None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class DataLoadError(Exception):
+    """Falha ao ler os itens do arquivo de entrada (já registrada no log)"""
+
+
+class HostBucket:
+    """Limite de requisições para um host: no máximo `rate` a cada `per` segundos (thread-safe)"""
+
+    def __init__(self, rate, per):
+        self.rate = rate
+        self.per = per
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserva uma requisição, esperando só se a janela atual já estiver cheia"""
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self.per:
+                self._sent.popleft()
+            if len(self._sent) >= self.rate:
+                time.sleep(self.per - (now - self._sent[0]))
+                self._sent.popleft()
+            self._sent.append(time.monotonic())
+
+    def release(self):
+        """Devolve a última reserva (ex.: resposta veio do cache, sem ir à rede)"""
+        with self._lock:
+            if self._sent:
+                self._sent.pop()
+
 
 class PlantImageFinder:
     """Classe aprimorada para buscar múltiplas imagens de plantas usando nome científico"""
@@ -35,61 +222,148 @@ class PlantImageFinder:
     def __init__(self, input_file='data.js', output_file='data_updated.js', max_workers=5):
         self.input_file = input_file
         self.output_file = output_file
-        self.session = requests.Session()
+        # Buscas concluídas, uma por linha, para retomar uma execução interrompida
+        self.progress_file = output_file + '.ndjson'
+        if CachedSession is not None:
+            # Cache SQLite ao lado do arquivo de saída: reexecuções não repetem
+            # consultas para nomes científicos já buscados
+            self.cache_file = os.path.join(os.path.dirname(output_file), 'plant_api_cache.sqlite')
+            self.session = CachedSession(
+                self.cache_file,
+                backend='sqlite',
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_codes=(200,),
+                stale_if_error=True
+            )
+        else:
+            self.cache_file = None
+            self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Connection': 'keep-alive'
         })
+        # Conexões reaproveitadas por host (o pool padrão de 10 esgota com muitos
+        # workers) e novas tentativas com backoff para erros temporários
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max_workers * 4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                # 429 é tratado em _get, que respeita o limite de cada host
+                status_forcelist=[500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Limites por host, abaixo dos recomendados por cada API
+        self._buckets = {
+            'commons.wikimedia.org': HostBucket(200, 60),
+            'api.inaturalist.org': HostBucket(60, 60)
+        }
         self.images_found = 0
         self.images_failed = 0
         self.max_workers = max_workers
-        self.delay_between_requests = 0.5  # Segundos entre requisições para evitar sobrecarga
+        # Workers que processam os itens, mantidos entre chamadas de update_items
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _get(self, url, **kwargs):
+        """
+        GET pela sessão compartilhada respeitando o limite de requisições do host.
+
+        Em HTTP 429 espera o tempo do Retry-After (ou um backoff exponencial,
+        com variação aleatória) e tenta de novo até RATE_LIMIT_RETRIES vezes.
+        """
+        bucket = self._buckets.get(urlparse(url).netloc)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if bucket:
+                bucket.acquire()
+            response = self.session.get(url, **kwargs)
+            if bucket and getattr(response, 'from_cache', False):
+                bucket.release()
+
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                return response
+
+            delay = _retry_after_seconds(response)
+            if delay is None:
+                delay = RATE_LIMIT_BACKOFF * 2 ** attempt
+            delay += random.uniform(0, RATE_LIMIT_BACKOFF)
+            logger.warning(f"  ⏳ Limite de requisições em {urlparse(url).netloc}, aguardando {delay:.1f}s")
+            time.sleep(delay)
 
     def extract_js_data(self):
-        """Extrai o array JavaScript do arquivo"""
+        """
+        Extrai os itens do array JavaScript do arquivo.
+
+        É um gerador: cada item é entregue assim que é parseado, sem montar
+        a lista inteira, para que a busca de imagens comece antes do fim da leitura.
+        """
+        json_str = ''
+        pos = 0
         try:
+            # Caminho rápido 1: arquivo .json irmão, mais novo que o .js
+            json_path = _json_sidecar_path(self.input_file)
+            if (os.path.exists(json_path)
+                    and os.path.getmtime(json_path) >= os.path.getmtime(self.input_file)):
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    items = json.load(f)
+                logger.info(f"✓ Carregados {len(items)} itens de {json_path}")
+                yield from items
+                return
+
             with open(self.input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
 
+            # Caminho rápido 2: o array já é JSON válido (ex.: gerado por save_updated_file)
+            module = _JSON_MODULE_RE.match(content)
+            if module:
+                try:
+                    items = json.loads(module.group(1))
+                except json.JSONDecodeError:
+                    items = None
+                if items is not None:
+                    logger.info(f"✓ Carregados {len(items)} itens do arquivo (JSON)")
+                    yield from items
+                    return
+
             # Encontrar o array data
-            match = re.search(r'const data = \[(.*?)\];', content, re.DOTALL)
+            match = _DATA_ARRAY_RE.search(content)
             if not match:
                 raise ValueError("Não foi encontrado 'const data' no arquivo")
 
-            array_content = match.group(1)
-
             # Converter JavaScript para JSON válido
-            # Remover comentários de linha
-            json_content = re.sub(r'//.*?$', '', array_content, flags=re.MULTILINE)
-            
-            # Remover comentários de bloco
-            json_content = re.sub(r'/\*.*?\*/', '', json_content, flags=re.DOTALL)
-
-            # Adicionar aspas nas chaves (converter JS object para JSON)
-            # Padrão: palavra seguida de dois pontos
-            json_content = re.sub(r'(\w+):', r'"\1":', json_content)
-            
-            # Corrigir aspas simples para duplas em strings
-            # Primeiro, proteger aspas simples dentro de strings já com aspas duplas
-            json_content = re.sub(r"'([^']*)'", lambda m: '"' + m.group(1).replace('"', '\\"') + '"', json_content)
-
-            # Adicionar colchetes para formar array JSON
-            json_str = f'[{json_content}]'
-
-            # Parsear JSON
-            items = json.loads(json_str)
-            logger.info(f"✓ Carregados {len(items)} itens do arquivo")
-            return items
-
-        except FileNotFoundError:
+            json_str = _js_to_json(match.group(1))
+
+            # Parsear um objeto por vez, pulando vírgulas e espaços entre eles
+            decoder = json.JSONDecoder()
+            n = len(json_str)
+            count = 0
+            while True:
+                while pos < n and json_str[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos >= n:
+                    break
+                item, pos = decoder.raw_decode(json_str, pos)
+                count += 1
+                yield item
+
+            logger.info(f"✓ Carregados {count} itens do arquivo")
+
+        # Levantar em vez de encerrar o processo: quem consome o gerador
+        # precisa cancelar as buscas que já enviou
+        except FileNotFoundError as e:
             logger.error(f"Arquivo não encontrado: {self.input_file}")
-            sys.exit(1)
+            raise DataLoadError(str(e)) from e
         except json.JSONDecodeError as e:
             logger.error(f"Erro ao parsear JSON: {e}")
-            logger.error(f"Conteúdo problemático (primeiros 500 chars): {json_str[:500]}")
-            sys.exit(1)
+            logger.error(f"Conteúdo problemático (500 chars a partir da posição {pos}): {json_str[pos:pos + 500]}")
+            raise DataLoadError(str(e)) from e
         except Exception as e:
             logger.error(f"Erro inesperado: {e}")
-            sys.exit(1)
+            raise DataLoadError(str(e)) from e
 
     def search_wikimedia(self, scientific_name):
         """Busca múltiplas imagens na Wikimedia Commons"""
@@ -107,23 +381,30 @@ class PlantImageFinder:
                 'srprop': 'url|size|snippet'
             }
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _json(response)
 
             if data.get('query', {}).get('search'):
-                for result in data['query']['search']:
-                    file_title = result['title'].replace('File:', '')
-                    
-                    # Buscar URL da imagem
-                    image_url = self._get_wikimedia_image_url(file_title)
-                    if image_url:
+                results = data['query']['search']
+                file_titles = [result['title'].replace('File:', '') for result in results]
+                
+                # Buscar URLs de todas as imagens numa única requisição
+                image_urls = self._get_wikimedia_image_urls(file_titles)
+                for result, file_title in zip(results, file_titles):
+                    image_data = image_urls.get(file_title)
+                    if image_data:
+                        # Formato final da imagem: dados do imageinfo junto com a busca
                         images.append({
                             'source': 'wikimedia',
-                            'url': image_url,
+                            'url': image_data.get('url'),
                             'title': result['title'],
-                            'size': result.get('size', 0),
-                            'snippet': result.get('snippet', ''),
+                            'width': image_data.get('width', 0),
+                            'height': image_data.get('height', 0),
+                            'size': image_data.get('size', 0),
+                            'description': image_data.get('description', ''),
+                            'license': image_data.get('license', ''),
+                            'artist': image_data.get('artist', ''),
                             'score': self._calculate_wikimedia_score(result)
                         })
             
@@ -137,24 +418,39 @@ class PlantImageFinder:
 
     def _get_wikimedia_image_url(self, file_title):
         """Obtém URL direto da imagem no Wikimedia"""
+        return self._get_wikimedia_image_urls([file_title]).get(file_title)
+
+    def _get_wikimedia_image_urls(self, file_titles):
+        """
+        Obtém URLs diretos de várias imagens do Wikimedia numa única requisição.
+
+        A API aceita até 50 títulos por chamada. Retorna um dicionário do título
+        do arquivo (sem o prefixo 'File:') para os dados da imagem; títulos sem
+        imagem ficam de fora.
+        """
         try:
             url = "https://commons.wikimedia.org/w/api.php"
             params = {
                 'action': 'query',
                 'format': 'json',
-                'titles': f'File:{file_title}',
+                'titles': '|'.join(f'File:{file_title}' for file_title in file_titles),
                 'prop': 'imageinfo',
                 'iiprop': 'url|size|dimensions|extmetadata'
             }
 
-            response = self.session.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self._get(url, params=params, timeout=10)
+            data = _json(response)
+            query = data.get('query', {})
+
+            # A API pode normalizar os títulos (ex.: '_' vira espaço); mapear de volta
+            normalized = {n['to']: n['from'] for n in query.get('normalized', [])}
 
-            pages = data.get('query', {}).get('pages', {})
-            for page_id, page_data in pages.items():
+            images = {}
+            for page_data in query.get('pages', {}).values():
                 if 'imageinfo' in page_data:
+                    title = normalized.get(page_data['title'], page_data['title'])
                     info = page_data['imageinfo'][0]
-                    return {
+                    images[title.replace('File:', '', 1)] = {
                         'url': info.get('url'),
                         'width': info.get('width', 0),
                         'height': info.get('height', 0),
@@ -164,10 +460,10 @@ class PlantImageFinder:
                         'artist': info.get('extmetadata', {}).get('Artist', {}).get('value', '')
                     }
 
-            return None
+            return images
         except Exception as e:
             logger.warning(f"  ✗ Erro ao obter URL Wikimedia: {e}")
-            return None
+            return {}
 
     def _calculate_wikimedia_score(self, result):
         """Calcula uma pontuação para a imagem do Wikimedia com base em vários fatores"""
@@ -183,13 +479,11 @@ class PlantImageFinder:
             score += 1
             
         # Verificar se o snippet contém termos relevantes
-        snippet = result.get('snippet', '').lower()
-        if any(term in snippet for term in ['plant', 'flower', 'leaf', 'fruit', 'tree']):
+        if _BOTANY_TERMS.search(result.get('snippet', '')):
             score += 3
             
         # Verificar se o título é descritivo
-        title = result.get('title', '').lower()
-        if any(term in title for term in ['plant', 'flower', 'leaf', 'fruit', 'tree']):
+        if _BOTANY_TERMS.search(result.get('title', '')):
             score += 2
             
         return score
@@ -209,9 +503,9 @@ class PlantImageFinder:
                 'per_page': '3'  # Aumentado para buscar mais opções
             }
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _json(response)
 
             if data.get('results'):
                 for taxon in data['results']:
@@ -265,134 +559,172 @@ class PlantImageFinder:
         wikimedia_images = self.search_wikimedia(scientific_name)
         all_images.extend(wikimedia_images)
         
-        # Pequeno atraso para não sobrecarregar as APIs
-        time.sleep(self.delay_between_requests)
-        
-        # 2. Buscar em iNaturalist (mesmo que já tenha encontrado em Wikimedia)
-        inaturalist_images = self.search_inaturalist(scientific_name)
-        all_images.extend(inaturalist_images)
+        # 2. Buscar em iNaturalist, a menos que o Wikimedia já tenha uma imagem confiável
+        best_score = max((img.get('score', 0) for img in wikimedia_images), default=0)
+        if best_score < CONFIDENT_SCORE:
+            inaturalist_images = self.search_inaturalist(scientific_name)
+            all_images.extend(inaturalist_images)
         
         # Processar as imagens encontradas
         if all_images:
             # Identificar a melhor imagem para destaque
-            featured_image = self._select_featured_image(all_images)
+            featured_idx = self._select_featured_index(all_images)
             
-            # Normalizar as URLs e adicionar informações adicionais
-            processed_images = []
-            for img in all_images:
-                # Se a imagem veio do Wikimedia, precisamos extrair a URL do dicionário
-                if img['source'] == 'wikimedia' and isinstance(img['url'], dict):
-                    img_data = img['url']
-                    processed_img = {
-                        'source': img['source'],
-                        'url': img_data.get('url'),
-                        'title': img.get('title', ''),
-                        'width': img_data.get('width', 0),
-                        'height': img_data.get('height', 0),
-                        'size': img_data.get('size', 0),
-                        'description': img_data.get('description', ''),
-                        'license': img_data.get('license', ''),
-                        'artist': img_data.get('artist', ''),
-                        'score': img.get('score', 0)
-                    }
-                else:
-                    processed_img = img.copy()
-                
-                # Adicionar timestamp de quando foi encontrada
-                processed_img['found_at'] = datetime.now().isoformat()
+            # Adicionar informações às imagens (já no formato final de cada fonte)
+            found_at = datetime.now().isoformat()
+            for i, img in enumerate(all_images):
+                # Timestamp de quando foi encontrada
+                img['found_at'] = found_at
                 
                 # Marcar se é a imagem em destaque
-                processed_img['featured'] = (processed_img == featured_image)
-                
-                processed_images.append(processed_img)
+                img['featured'] = (i == featured_idx)
             
-            self.images_found += len(processed_images)
+            self.images_found += len(all_images)
             return {
-                'images': processed_images,
-                'featured_image': featured_image,
-                'total_images': len(processed_images)
+                'images': all_images,
+                'featured_image': all_images[featured_idx],
+                'total_images': len(all_images)
             }
 
         logger.warning(f"  ✗ Nenhuma imagem encontrada para {scientific_name}")
         self.images_failed += 1
         return None
 
-    def _select_featured_image(self, images):
-        """Seleciona a melhor imagem para destaque com base em critérios de qualidade"""
-        if not images:
-            return None
-            
-        # Ordenar por pontuação (maior primeiro)
-        sorted_images = sorted(images, key=lambda x: x.get('score', 0), reverse=True)
-        
-        # A imagem com maior pontuação é a destacada
-        featured = sorted_images[0]
-        
-        # Se a imagem veio do Wikimedia, precisamos extrair a URL do dicionário
-        if featured['source'] == 'wikimedia' and isinstance(featured['url'], dict):
-            featured_copy = featured.copy()
-            featured_copy['url'] = featured['url'].get('url')
-            return featured_copy
-            
-        return featured
+    def _select_featured_index(self, images):
+        """Posição da melhor imagem para destaque: a de maior pontuação (a primeira, em caso de empate)"""
+        return max(range(len(images)), key=lambda i: images[i].get('score', 0))
 
     def update_items(self, items):
-        """Atualiza items com múltiplas URLs de imagens e destaca a melhor"""
-        # Usar ThreadPoolExecutor para processar em paralelo (com limite para evitar sobrecarga)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Criar uma função parcial que inclui o item_id
-            find_images_partial = partial(self._find_images_with_id, items)
-            
-            # Enviar todas as tarefas para o executor
-            future_to_index = {
-                executor.submit(find_images_partial, item): index 
-                for index, item in enumerate(items)
-                if item.get('scientificName')
-            }
+        """
+        Atualiza items com múltiplas URLs de imagens e destaca a melhor.
+
+        Aceita qualquer iterável (inclusive o gerador de extract_js_data): as
+        buscas são enviadas ao executor conforme os itens chegam, uma por nome
+        científico (itens repetidos recebem o mesmo resultado). Retorna a
+        lista completa de itens atualizados.
+
+        Cada busca concluída é gravada em self.progress_file; nomes já
+        presentes nele (de uma execução interrompida) não são buscados de novo.
+        """
+        loaded = []
+        saved = self._load_progress()
+        if saved:
+            logger.info(f"↻ Retomando: {len(saved)} buscas já concluídas em {self.progress_file}")
+
+        with open(self.progress_file, 'ab') as progress:
+            # Enviar cada tarefa ao pool de workers da instância assim que o item é
+            # lido; itens com um nome científico já enviado aguardam a mesma busca
+            future_to_indices = {}
+            name_to_future = {}
+            try:
+                for index, item in enumerate(items):
+                    loaded.append(item)
+                    scientific_name = item.get('scientificName')
+                    if not scientific_name:
+                        continue
+                    if scientific_name in saved:
+                        item.update(saved[scientific_name])
+                        continue
+                    future = name_to_future.get(scientific_name)
+                    if future is None:
+                        future = self._executor.submit(self._find_for_item, index, item)
+                        name_to_future[scientific_name] = future
+                        future_to_indices[future] = []
+                    future_to_indices[future].append(index)
+            except Exception:
+                # Leitura interrompida: descartar as buscas ainda na fila, cujos
+                # resultados nunca seriam gravados (Future.cancel em vez de
+                # shutdown(cancel_futures=True), que só existe no Python 3.9+)
+                for future in future_to_indices:
+                    future.cancel()
+                raise
             
             # Processar os resultados conforme forem concluídos
-            for future in as_completed(future_to_index):
-                index = future_to_index[future]
+            for future in as_completed(future_to_indices):
+                indices = future_to_indices[future]
                 try:
                     result = future.result()
                     if result:
-                        items[index]['images'] = result['images']
-                        items[index]['featured_image'] = result['featured_image']
-                        items[index]['total_images'] = result['total_images']
-                        items[index]['images_updated'] = datetime.now().isoformat()
+                        update = {
+                            'images': result['images'],
+                            'featured_image': result['featured_image'],
+                            'total_images': result['total_images'],
+                            'images_updated': datetime.now().isoformat()
+                        }
+                        for index in indices:
+                            loaded[index].update(update)
+                        
+                        # Registrar o progresso imediatamente
+                        scientific_name = loaded[indices[0]]['scientificName']
+                        progress.write(_json_line({'scientificName': scientific_name, **update}))
+                        progress.flush()
                 except Exception as e:
-                    logger.error(f"Erro ao processar item {index}: {e}")
+                    logger.error(f"Erro ao processar itens {', '.join(map(str, indices))}: {e}")
         
-        return items
-
-    def _find_images_with_id(self, items, item):
-        """Função auxiliar para passar o item_id junto com a busca de imagens"""
-        item_id = item.get('id', items.index(item))
+        return loaded
+
+    def _load_progress(self):
+        """Buscas gravadas em self.progress_file: nome científico -> campos do item"""
+        saved = {}
+        if not os.path.exists(self.progress_file):
+            return saved
+
+        with open(self.progress_file, 'rb+') as f:
+            data = f.read()
+            # Descartar uma linha incompleta no fim (execução interrompida durante
+            # a gravação), para que as próximas linhas não sejam anexadas a ela
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                f.truncate(end)
+
+        for line in data[:end].splitlines():
+            record = json.loads(line)
+            saved[record.pop('scientificName')] = record
+        return saved
+
+    def _find_for_item(self, index, item):
+        """Busca imagens de um item, identificado pelo id ou, na falta dele, pela posição"""
+        item_id = item.get('id', index)
         scientific_name = item.get('scientificName')
         return self.find_images(scientific_name, item_id)
 
     def save_updated_file(self, items):
         """Salva items atualizados com múltiplas imagens em arquivo JavaScript"""
         try:
-            # Converter para JSON formatado com indentação de 2 espaços
-            json_content = json.dumps(items, ensure_ascii=False, indent=2)
-
-            # Criar conteúdo JavaScript (mantém compatibilidade com data.js)
-            js_content = f"""const allItems = {json_content};
-
-export default allItems;
-"""
-
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                f.write(js_content)
+            json_path = _json_sidecar_path(self.output_file)
+
+            # Gravar JavaScript (mantém compatibilidade com data.js), com o JSON
+            # formatado com indentação de 2 espaços, e uma cópia em JSON puro,
+            # lida diretamente por extract_js_data em execuções futuras
+            if orjson is not None:
+                # orjson codifica com indentação em código nativo; o json padrão
+                # troca para o codificador em Python puro quando há indent
+                with open(self.output_file, 'wb') as f:
+                    f.write(b'const allItems = ')
+                    f.write(orjson.dumps(items, option=orjson.OPT_INDENT_2))
+                    f.write(b';\n\nexport default allItems;\n')
+                with open(json_path, 'wb') as f:
+                    f.write(orjson.dumps(items))
+            else:
+                with open(self.output_file, 'w', encoding='utf-8') as f:
+                    f.write('const allItems = ')
+                    json.dump(items, f, ensure_ascii=False, indent=2)
+                    f.write(';\n\nexport default allItems;\n')
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(items, f, ensure_ascii=False)
 
             logger.info(f"✓ Arquivo atualizado salvo em: {self.output_file}")
+            logger.info(f"  Cópia JSON: {json_path}")
             logger.info(f"  Total de itens: {len(items)}")
 
         except Exception as e:
             logger.error(f"Erro ao salvar arquivo: {e}")
             sys.exit(1)
 
+    def close(self):
+        """Encerra o pool de threads da instância"""
+        self._executor.shutdown()
+
     def print_summary(self):
         """Exibe resumo da execução"""
         total = self.images_found + self.images_failed
@@ -413,16 +745,19 @@ export default allItems;
         """Executa o pipeline completo"""
         logger.info("🌿 Iniciando busca de imagens de plantas...")
 
-        # 1. Carregar dados
+        # 1. Carregar dados (gerador: os itens são lidos durante a busca)
         items = self.extract_js_data()
 
         # 2. Buscar imagens
         logger.info("🔍 Buscando imagens...")
         items_updated = self.update_items(items)
+        self.close()
 
-        # 3. Salvar arquivo
+        # 3. Salvar arquivo (o progresso parcial deixa de ser necessário)
         logger.info("💾 Salvando arquivo atualizado...")
         self.save_updated_file(items_updated)
+        if os.path.exists(self.progress_file):
+            os.remove(self.progress_file)
 
         # 4. Exibir resumo
         self.print_summary()
@@ -446,15 +781,17 @@ def main():
     if not check_dependencies():
         sys.exit(1)
     
-    # Configurar argumentos
-    input_file = sys.argv[1] if len(sys.argv) > 1 else 'src/components/Library/data.js'
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'src/components/Library/data_updated.js'
-    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    # Configurar argumentos (--no-cache limpa o cache de respostas antes de buscar)
+    clear_cache = '--no-cache' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    input_file = args[0] if len(args) > 0 else 'src/components/Library/data.js'
+    output_file = args[1] if len(args) > 1 else 'src/components/Library/data_updated.js'
+    max_workers = int(args[2]) if len(args) > 2 else 5
 
     # Verificar se arquivo de entrada existe
     if not os.path.exists(input_file):
         logger.error(f"❌ Arquivo não encontrado: {input_file}")
-        logger.info("   Uso: python plant_image.py [input_file] [output_file] [max_workers]")
+        logger.info("   Uso: python plant_image.py [input_file] [output_file] [max_workers] [--no-cache]")
         sys.exit(1)
 
     # Executar
@@ -463,7 +800,15 @@ def main():
     logger.info(f"⚙️  Workers simultâneos: {max_workers}\n")
     
     finder = PlantImageFinder(input_file, output_file, max_workers)
-    finder.run()
+    if finder.cache_file:
+        logger.info(f"🗄️  Cache de respostas: {finder.cache_file}")
+        if clear_cache:
+            finder.session.cache.clear()
+            logger.info("   Cache limpo (--no-cache)")
+    try:
+        finder.run()
+    except DataLoadError:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
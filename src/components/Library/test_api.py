@@ -6,24 +6,21 @@ Tests all endpoints to verify the API is working correctly.
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 API_BASE = 'http://localhost:5000/api'
 
-def test_health():
+def check_health(data):
     """Test health endpoint."""
     print("Testing /api/health...")
-    response = requests.get(f'{API_BASE}/health')
-    data = response.json()
     assert data['success'], "Health check failed"
     assert data['status'] == 'healthy', "API is not healthy"
     print(f"  ✓ API is healthy, {data['plants']} plants in database")
 
-def test_stats():
+def check_stats(data):
     """Test stats endpoint."""
     print("\nTesting /api/stats...")
-    response = requests.get(f'{API_BASE}/stats')
-    data = response.json()
     assert data['success'], "Stats request failed"
     stats = data['data']
     print(f"  ✓ Total plants: {stats['total']}")
@@ -31,22 +28,18 @@ def test_stats():
     print(f"  ✓ Introduced: {stats['byOrigin'].get('INTRODUCED', 0)}")
     print(f"  ✓ With warnings: {stats['withWarnings']}")
 
-def test_categories():
+def check_categories(data):
     """Test categories endpoint."""
     print("\nTesting /api/categories...")
-    response = requests.get(f'{API_BASE}/categories')
-    data = response.json()
     assert data['success'], "Categories request failed"
     categories = data['data']
     print(f"  ✓ Found {len(categories)} categories:")
     for cat in categories[:5]:
         print(f"    - {cat['name']}: {cat['count']}")
 
-def test_plants():
+def check_plants(data):
     """Test plants endpoint."""
     print("\nTesting /api/plants...")
-    response = requests.get(f'{API_BASE}/plants?limit=5')
-    data = response.json()
     assert data['success'], "Plants request failed"
     plants = data['data']
     print(f"  ✓ Retrieved {len(plants)} plants (limit=5)")
@@ -54,22 +47,18 @@ def test_plants():
         plant = plants[0]
         print(f"    First plant: {plant['name']} ({plant['scientificName']})")
 
-def test_plants_filtered():
+def check_plants_filtered(data):
     """Test plants endpoint with filters."""
     print("\nTesting /api/plants with filters...")
-    response = requests.get(f'{API_BASE}/plants?type=FRUITS&origin=NATIVE&limit=3')
-    data = response.json()
     assert data['success'], "Filtered plants request failed"
     plants = data['data']
     print(f"  ✓ Found {len(plants)} native fruits (limit=3)")
     for plant in plants:
         print(f"    - {plant['name']}")
 
-def test_single_plant():
+def check_single_plant(data):
     """Test single plant endpoint."""
     print("\nTesting /api/plants/:id...")
-    response = requests.get(f'{API_BASE}/plants/F1')
-    data = response.json()
     assert data['success'], "Single plant request failed"
     plant = data['data']
     print(f"  ✓ Retrieved plant: {plant['name']}")
@@ -78,17 +67,32 @@ def test_single_plant():
     print(f"    Origin: {plant['origin']}")
     print(f"    Uses: {', '.join(plant['uses'][:3])}...")
 
-def test_search():
+def check_search(data):
     """Test search endpoint."""
     print("\nTesting /api/search...")
-    response = requests.get(f'{API_BASE}/search?q=açaí')
-    data = response.json()
     assert data['success'], "Search request failed"
     results = data['data']
     print(f"  ✓ Search for 'açaí' found {len(results)} results")
     if results:
         print(f"    First result: {results[0]['name']}")
 
+# Endpoint checks: path under API_BASE and the function that validates its response
+CHECKS = [
+    ('/health', check_health),
+    ('/stats', check_stats),
+    ('/categories', check_categories),
+    ('/plants?limit=5', check_plants),
+    ('/plants?type=FRUITS&origin=NATIVE&limit=3', check_plants_filtered),
+    ('/plants/F1', check_single_plant),
+    ('/search?q=açaí', check_search),
+]
+
+def fetch_all(paths):
+    """Fetch all endpoints concurrently over one keep-alive session."""
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        responses = executor.map(lambda path: session.get(f'{API_BASE}{path}'), paths)
+        return [response.json() for response in responses]
+
 def main():
     """Run all tests."""
     print("="*60)
@@ -103,13 +107,10 @@ def main():
         return False
     
     try:
-        test_health()
-        test_stats()
-        test_categories()
-        test_plants()
-        test_plants_filtered()
-        test_single_plant()
-        test_search()
+        # Requests run in parallel; checks run in order so output stays readable
+        results = fetch_all([path for path, _ in CHECKS])
+        for (_, check), data in zip(CHECKS, results):
+            check(data)
         
         print("\n" + "="*60)
         print("✓ ALL TESTS PASSED")
@@ -161,40 +161,24 @@ export function useSQLite() {
     return enrichPlant(plants[0])
   }
 
+  /**
+   * Parse a JSON array column, treating NULL as empty
+   */
+  const parseJsonColumn = (value) => (value ? JSON.parse(value) : [])
+
   /**
    * Enrich plant with related data (uses, harvest months, etc.)
+   * All of it is stored as JSON columns on the plant row, so no extra queries are needed
    */
   const enrichPlant = (plant) => {
-    // Get uses
-    const uses = queryAsObjects(
-      'SELECT use_name FROM plant_uses WHERE plant_id = ?',
-      [plant.id]
-    ).map(row => row.use_name)
-
-    // Get harvest months
-    const harvestMonths = queryAsObjects(
-      'SELECT month FROM harvest_months WHERE plant_id = ? ORDER BY month',
-      [plant.id]
-    ).map(row => row.month)
-
-    // Get certifications
-    const certification = queryAsObjects(
-      'SELECT certification FROM certifications WHERE plant_id = ?',
-      [plant.id]
-    ).map(row => row.certification)
-
-    // Get keywords
-    const keywords = queryAsObjects(
-      'SELECT keyword FROM keywords WHERE plant_id = ?',
-      [plant.id]
-    ).map(row => row.keyword)
+    const { uses_json, harvest_months_json, certification_json, keywords_json, ...fields } = plant
 
     return {
-      ...plant,
-      uses,
-      harvestMonths,
-      certification,
-      keywords
+      ...fields,
+      uses: parseJsonColumn(uses_json),
+      harvestMonths: parseJsonColumn(harvest_months_json),
+      certification: parseJsonColumn(certification_json),
+      keywords: parseJsonColumn(keywords_json)
     }
   }
 
@@ -1,46 +1,62 @@
 import sqlite3
 
 conn = sqlite3.connect('data.sqlite')
+conn.row_factory = sqlite3.Row
 cursor = conn.cursor()
 
-# Show tables
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-tables = cursor.fetchall()
-print("Tables in database:")
-for table in tables:
-    print(f"  - {table[0]}")
-
-# Show sample plants
-print("\nSample plants:")
-cursor.execute("SELECT id, name, type, origin FROM plants LIMIT 10")
-for row in cursor.fetchall():
-    print(f"  {row[0]}: {row[1]} ({row[2]}, {row[3]})")
-
-# Show statistics
-cursor.execute("SELECT type, COUNT(*) FROM plants GROUP BY type")
-print("\nPlants by type:")
-for row in cursor.fetchall():
-    print(f"  {row[0]}: {row[1]}")
-
-# Show a complete plant record
-print("\nDetailed view of first plant:")
-cursor.execute("SELECT * FROM plants LIMIT 1")
-plant = cursor.fetchone()
-cursor.execute("PRAGMA table_info(plants)")
-columns = [col[1] for col in cursor.fetchall()]
-
-for col, val in zip(columns, plant):
-    if val:
-        print(f"  {col}: {val}")
-
-# Show related data
-plant_id = plant[0]
-cursor.execute("SELECT use_name FROM plant_uses WHERE plant_id = ?", (plant_id,))
-uses = [row[0] for row in cursor.fetchall()]
-print(f"\n  Uses: {', '.join(uses)}")
-
-cursor.execute("SELECT month FROM harvest_months WHERE plant_id = ? ORDER BY month", (plant_id,))
-months = [row[0] for row in cursor.fetchall()]
-print(f"  Harvest months: {months}")
+with conn:
+    # Tables, sample plants and counts by type in a single query,
+    # tagged by section and split apart below
+    cursor.execute("""
+        SELECT 'table' AS section, name AS a, NULL AS b, NULL AS c, NULL AS d
+        FROM sqlite_master WHERE type='table'
+        UNION ALL
+        SELECT 'sample', id, name, type, origin
+        FROM (SELECT id, name, type, origin FROM plants LIMIT 10)
+        UNION ALL
+        SELECT 'count', type, COUNT(*), NULL, NULL
+        FROM plants GROUP BY type
+    """)
+    sections = {'table': [], 'sample': [], 'count': []}
+    for row in cursor.fetchall():
+        sections[row['section']].append(row)
+
+    # Show tables
+    print("Tables in database:")
+    for row in sections['table']:
+        print(f"  - {row['a']}")
+
+    # Show sample plants
+    print("\nSample plants:")
+    for row in sections['sample']:
+        print(f"  {row['a']}: {row['b']} ({row['c']}, {row['d']})")
+
+    # Show statistics
+    print("\nPlants by type:")
+    for row in sections['count']:
+        print(f"  {row['a']}: {row['b']}")
+
+    # Show a complete plant record
+    print("\nDetailed view of first plant:")
+    cursor.execute("SELECT * FROM plants LIMIT 1")
+    plant = cursor.fetchone()
+
+    for col, val in dict(plant).items():
+        if val:
+            print(f"  {col}: {val}")
+
+    # Show related data
+    cursor.execute("""
+        SELECT
+            (SELECT GROUP_CONCAT(use_name, ', ') FROM plant_uses WHERE plant_id = :id) AS uses,
+            (SELECT GROUP_CONCAT(month) FROM (
+                SELECT month FROM harvest_months WHERE plant_id = :id ORDER BY month
+            )) AS months
+    """, {'id': plant['id']})
+    related = cursor.fetchone()
+    print(f"\n  Uses: {related['uses'] or ''}")
+
+    months = [int(month) for month in related['months'].split(',')] if related['months'] else []
+    print(f"  Harvest months: {months}")
 
 conn.close()